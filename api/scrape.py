@@ -6,41 +6,75 @@ Vercel Python API endpoint for court scraping
 import os
 import sys
 import json
+import orjson
+import shutil
 import tempfile
 import zipfile
 from pathlib import Path
+from urllib.parse import urlparse
 
-# Add the parent directory to the path so we can import court_scraper
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Parent directory holding court_scraper.py
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-from court_scraper import CourtPDFScraper
+# URLs the scraper may be pointed at
+_ALLOWED_SCHEMES = frozenset({'http', 'https'})
+_ALLOWED_HOSTS = frozenset({'search.txcourts.gov'})
+
+# Response headers shared by every reply (never mutated)
+_ALLOWED_ORIGIN = 'https://texas-court-scraper-5ve5.vercel.app'
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': _ALLOWED_ORIGIN,
+    'Content-Type': 'application/json',
+}
+_PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Origin': _ALLOWED_ORIGIN,
+    'Access-Control-Allow-Methods': 'POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+# Static response bodies, serialized once
+_PONG = orjson.dumps({'status': 'pong'}).decode()
+_ERR_METHOD = orjson.dumps({'error': 'Method not allowed'}).decode()
+_ERR_URL_REQUIRED = orjson.dumps({'error': 'URL is required'}).decode()
+_ERR_URL_SCHEME = orjson.dumps({'error': 'Invalid URL scheme'}).decode()
+_ERR_URL_HOST = orjson.dumps({'error': 'URL not allowed. Only Texas court websites are supported.'}).decode()
+_ERR_URL_FORMAT = orjson.dumps({'error': 'Invalid URL format'}).decode()
+_NO_PDFS = orjson.dumps({
+    'success': False,
+    'message': 'No PDF documents found on the page',
+    'pdf_count': 0
+}).decode()
+
+def _resp(status_code, body, headers=_CORS_HEADERS):
+    """Build a handler response."""
+    return {'statusCode': status_code, 'headers': headers, 'body': body}
+
+def is_warmup_request(request):
+    """Check for a scheduled ping that only keeps the container warm."""
+    path = getattr(request, 'path', '') or ''
+    if path.rstrip('/').endswith(('/warmup', '/ping')):
+        return True
+    
+    headers = getattr(request, 'headers', None) or {}
+    return any(key.lower() == 'x-warmup' and str(value) == '1'
+               for key, value in headers.items())
 
 def handler(request):
     """Vercel serverless function handler."""
     
+    # Answer warm-up pings right away, before importing the scraper
+    if is_warmup_request(request):
+        return _resp(200, _PONG)
+    
     # Handle CORS preflight requests
     if request.method == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type',
-            },
-            'body': ''
-        }
+        return _resp(200, '', _PREFLIGHT_HEADERS)
     
     # Only allow POST requests for scraping
     if request.method != 'POST':
-        return {
-            'statusCode': 405,
-            'headers': {
-                'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                'Content-Type': 'application/json',
-            },
-            'body': json.dumps({'error': 'Method not allowed'})
-        }
+        return _resp(405, _ERR_METHOD)
     
+    temp_dir = None
     try:
         # Parse request body
         if hasattr(request, 'get_json'):
@@ -56,78 +90,54 @@ def handler(request):
         merge_texts = data.get('merge_texts', False)
         
         if not url:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                    'Content-Type': 'application/json',
-                },
-                'body': json.dumps({'error': 'URL is required'})
-            }
+            return _resp(400, _ERR_URL_REQUIRED)
         
         # Security: Validate URL to prevent SSRF attacks
-        from urllib.parse import urlparse
         try:
             parsed = urlparse(url)
-            if parsed.scheme not in ('http', 'https'):
-                return {
-                    'statusCode': 400,
-                    'headers': {
-                        'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                        'Content-Type': 'application/json',
-                    },
-                    'body': json.dumps({'error': 'Invalid URL scheme'})
-                }
-            
-            # Only allow Texas court websites
-            allowed_hosts = ['search.txcourts.gov']
-            if parsed.hostname not in allowed_hosts:
-                return {
-                    'statusCode': 400,
-                    'headers': {
-                        'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                        'Content-Type': 'application/json',
-                    },
-                    'body': json.dumps({'error': 'URL not allowed. Only Texas court websites are supported.'})
-                }
-        except Exception:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                    'Content-Type': 'application/json',
-                },
-                'body': json.dumps({'error': 'Invalid URL format'})
-            }
+        except ValueError:
+            # e.g. an unbalanced IPv6 bracket in the netloc
+            return _resp(400, _ERR_URL_FORMAT)
+        
+        if parsed.scheme not in _ALLOWED_SCHEMES:
+            return _resp(400, _ERR_URL_SCHEME)
+        
+        # Only allow Texas court websites
+        if parsed.hostname not in _ALLOWED_HOSTS:
+            return _resp(400, _ERR_URL_HOST)
         
         # Create temporary directory for this request
         temp_dir = tempfile.mkdtemp()
         output_dir = os.path.join(temp_dir, "court_case")
         
-        # Initialize scraper with our proven class
-        scraper = CourtPDFScraper(output_dir=output_dir, merge_texts=merge_texts)
+        # Import the scraper only once a request actually needs it, so
+        # preflight and rejected requests don't pay for it on a cold start
+        if _ROOT_DIR not in sys.path:
+            sys.path.append(_ROOT_DIR)
+        from court_scraper import CourtPDFScraper
         
-        # Run the scraper
-        results = scraper.scrape_case_page(url)
+        # Initialize scraper with our proven class
+        # (PDFs stay in memory; only the extracted text touches /tmp)
+        with CourtPDFScraper(output_dir=output_dir, merge_texts=merge_texts,
+                             save_pdfs=False) as scraper:
+            # Run the scraper
+            results = scraper.scrape_case_page(url)
         
         total_files = len(results.get('pdfs', []))
         
         if total_files == 0:
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                    'Content-Type': 'application/json',
-                },
-                'body': json.dumps({
-                    'success': False,
-                    'message': 'No PDF documents found on the page',
-                    'pdf_count': 0
-                })
-            }
+            return _resp(200, _NO_PDFS)
+        
+        # Merged mode with no merged file means every document failed
+        if merge_texts and 'merged_file' not in results:
+            return _resp(200, orjson.dumps({
+                'success': False,
+                'message': 'No documents were successfully processed',
+                'pdf_count': total_files
+            }).decode())
         
         # Prepare response based on output format
-        if merge_texts and 'merged_file' in results:
+        if merge_texts:
             # Read merged file content
             merged_file = results['merged_file']
             with open(merged_file, 'r', encoding='utf-8') as f:
@@ -165,41 +175,15 @@ def handler(request):
                 'documents': documents
             }
         
-        # Clean up temp directory
-        import shutil
-        try:
-            shutil.rmtree(temp_dir)
-        except:
-            pass
-        
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                'Content-Type': 'application/json',
-            },
-            'body': json.dumps(response_data)
-        }
+        return _resp(200, orjson.dumps(response_data).decode())
         
     except Exception as e:
-        # Clean up temp directory on error
-        try:
-            import shutil
-            shutil.rmtree(temp_dir)
-        except:
-            pass
-        
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Access-Control-Allow-Origin': 'https://texas-court-scraper-5ve5.vercel.app',
-                'Content-Type': 'application/json',
-            },
-            'body': json.dumps({
-                'success': False,
-                'error': str(e)
-            })
-        }
+        return _resp(500, orjson.dumps({'success': False, 'error': str(e)}).decode())
+    
+    finally:
+        # Clean up temp directory on every path, early returns included
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
 # Vercel expects this format
 def lambda_handler(event, context):
@@ -208,6 +192,8 @@ def lambda_handler(event, context):
         def __init__(self, event):
             self.method = event.get('httpMethod', event.get('requestContext', {}).get('http', {}).get('method', 'GET'))
             self.body = event.get('body', '')
+            self.path = event.get('rawPath', event.get('path', ''))
+            self.headers = event.get('headers') or {}
             
     request = Request(event)
     response = handler(request)
@@ -5,20 +5,56 @@ Flask web application for downloading and converting Texas court documents.
 """
 
 import os
+import shutil
+import uuid
 import tempfile
 import zipfile
-from flask import Flask, render_template, request, jsonify, send_file, after_this_request
+import orjson
+from flask import Flask, Response, render_template, request, jsonify, send_file, after_this_request, redirect
+from flask.json.provider import JSONProvider
 from werkzeug.utils import secure_filename
 import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from court_scraper import CourtPDFScraper
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, which is much faster on large text."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
 
 # Store active scraping jobs
 active_jobs = {}
+jobs_lock = threading.Lock()
+
+# Optional shared stores so /status and /download work on any worker:
+# job state goes to Redis (REDIS_URL) and finished results to S3 (S3_BUCKET).
+# Without them, jobs only live in the process that started them.
+JOB_TTL = 3600
+redis_client = None
+if os.environ.get('REDIS_URL'):
+    import redis
+    redis_client = redis.Redis(connection_pool=redis.BlockingConnectionPool.from_url(
+        os.environ['REDIS_URL'], max_connections=32, decode_responses=True))
+
+S3_BUCKET = os.environ.get('S3_BUCKET')
+s3_client = None
+if S3_BUCKET:
+    import boto3
+    s3_client = boto3.client('s3')
+
+# Jobs share a bounded pool instead of each getting its own thread.
+# Its threads are not daemons: at interpreter exit Python joins them, so
+# stopping the server waits for running scrapes and drains queued ones.
+job_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('MAX_CONCURRENT_JOBS', 4)))
 
 class WebScrapingJob:
     def __init__(self, job_id, url, merge_texts=False):
@@ -32,35 +68,126 @@ class WebScrapingJob:
         self.results = {}
         self.error = None
         self.temp_dir = None
+        self.s3_key = None
+        # Download threads update progress while requests read it
+        self._lock = threading.RLock()
+    
+    def state(self):
+        """Return the job's public status fields."""
+        with self._lock:
+            state = {
+                'status': self.status,
+                'progress': self.progress,
+                'total_files': self.total_files,
+                'processed_files': self.processed_files
+            }
+            
+            if self.error:
+                state['error'] = self.error
+            
+            if self.status == 'completed':
+                if self.merge_texts:
+                    state['download_type'] = 'merged'
+                    state['file_count'] = 1
+                else:
+                    state['download_type'] = 'separate'
+                    state['file_count'] = len(self.results.get('txt_files', []))
+            
+            if self.s3_key:
+                state['s3_key'] = self.s3_key
+            
+            return state
+    
+    def publish(self):
+        """Copy the job's state to Redis, if configured."""
+        if redis_client is None:
+            return
+        key = f'job:{self.job_id}'
+        # Held across the write so a stale snapshot can't overwrite a newer one
+        with self._lock:
+            pipe = redis_client.pipeline()
+            pipe.hset(key, mapping=self.state())
+            pipe.expire(key, JOB_TTL)
+            pipe.execute()
+    
+    def download_file(self):
+        """Return (path, download name, mimetype) for the results, or None."""
+        if self.merge_texts:
+            # Return single merged file
+            merged_file = self.results.get('merged_file')
+            if merged_file and os.path.exists(merged_file):
+                return merged_file, 'merged_court_documents.txt', 'text/plain'
+            return None
+        
+        # Create ZIP file with all text files
+        zip_name = f'court_documents_{self.job_id}.zip'
+        zip_path = os.path.join(self.temp_dir, zip_name)
+        
+        # Fastest DEFLATE level: extracted text still shrinks well, at a
+        # fraction of the CPU cost of the default level
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            txt_files = self.results.get('txt_files', [])
+            for txt_file in txt_files:
+                if os.path.exists(txt_file):
+                    zipf.write(txt_file, os.path.basename(txt_file))
+        
+        return zip_path, zip_name, 'application/zip'
+    
+    def upload_results(self):
+        """Upload the finished results to S3 and drop the local copy."""
+        download = self.download_file()
+        if download is None:
+            return
+        path, download_name, mimetype = download
+        key = f'jobs/{self.job_id}/{download_name}'
+        s3_client.upload_file(path, S3_BUCKET, key, ExtraArgs={
+            'ContentType': mimetype,
+            'ContentDisposition': f'attachment; filename="{download_name}"'
+        })
+        self.s3_key = key
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def run(self):
-        """Run the scraping job in a separate thread."""
+        """Run the scraping job on the shared job pool."""
         try:
             self.status = "scraping"
+            self.publish()
             
             # Create temporary directory for this job
             self.temp_dir = tempfile.mkdtemp()
             output_dir = os.path.join(self.temp_dir, f"court_case_{self.job_id}")
             
             # Initialize scraper
-            scraper = CourtPDFScraper(output_dir=output_dir, merge_texts=self.merge_texts)
-            
-            # Custom callback to update progress
-            original_download = scraper.download_pdf
-            def download_with_progress(pdf_info):
-                result = original_download(pdf_info)
-                if result:
-                    self.processed_files += 1
-                    self.progress = int((self.processed_files / self.total_files) * 100) if self.total_files > 0 else 0
-                return result
-            
-            scraper.download_pdf = download_with_progress
-            
-            # Run the scraper
-            self.status = "downloading"
-            results = scraper.scrape_case_page(self.url)
+            with CourtPDFScraper(output_dir=output_dir, merge_texts=self.merge_texts,
+                                 save_pdfs=False) as scraper:
+                # Custom callbacks to update progress: the total is known
+                # once the case page is parsed, before any download finishes
+                original_get_links = scraper.get_pdf_links
+                def get_links_with_total(url):
+                    pdf_links = original_get_links(url)
+                    with self._lock:
+                        self.total_files = len(pdf_links)
+                        self.publish()
+                    return pdf_links
+                
+                original_download = scraper.download_pdf
+                def download_with_progress(pdf_info):
+                    result = original_download(pdf_info)
+                    if result:
+                        with self._lock:
+                            self.processed_files += 1
+                            self.progress = int((self.processed_files / self.total_files) * 100) if self.total_files > 0 else 0
+                            self.publish()
+                    return result
+                
+                scraper.get_pdf_links = get_links_with_total
+                scraper.download_pdf = download_with_progress
+                
+                # Run the scraper
+                self.status = "downloading"
+                self.publish()
+                results = scraper.scrape_case_page(self.url)
             
-            self.total_files = len(results.get('pdfs', []))
             self.results = results
             self.results['output_dir'] = output_dir
             
@@ -71,10 +198,30 @@ class WebScrapingJob:
             else:
                 self.status = "error"
                 self.error = "No documents were successfully processed"
+            
+            if self.status == "completed" and s3_client is not None:
+                self.upload_results()
                 
         except Exception as e:
             self.status = "error"
             self.error = str(e)
+        finally:
+            self.publish()
+
+def load_job_state(job_id):
+    """Look up a job's state in Redis, or in this process without it."""
+    if redis_client is not None:
+        state = redis_client.hgetall(f'job:{job_id}')
+        if not state:
+            return None
+        for field in ('progress', 'total_files', 'processed_files', 'file_count'):
+            if field in state:
+                state[field] = int(state[field])
+        return state
+    
+    with jobs_lock:
+        job = active_jobs.get(job_id)
+    return job.state() if job is not None else None
 
 @app.route('/')
 def index():
@@ -91,101 +238,115 @@ def scrape():
     if not url:
         return jsonify({'error': 'URL is required'}), 400
     
-    # Generate job ID
-    job_id = str(int(time.time() * 1000))
+    # Generate job ID (unique across workers)
+    job_id = uuid.uuid4().hex
     
     # Create and start job
     job = WebScrapingJob(job_id, url, merge_texts)
-    active_jobs[job_id] = job
+    with jobs_lock:
+        active_jobs[job_id] = job
+    job.publish()
     
-    # Start scraping in background thread
-    thread = threading.Thread(target=job.run)
-    thread.daemon = True
-    thread.start()
+    # Queue scraping on the background job pool
+    job_executor.submit(job.run)
     
     return jsonify({
         'job_id': job_id,
         'status': 'started'
     })
 
+@app.route('/scrape/stream', methods=['POST'])
+def scrape_stream():
+    """Scrape a case page and stream documents back as NDJSON.
+    
+    Each line is one JSON object, sent as soon as that document has been
+    converted, so nothing is buffered into one large response. The first
+    line carries the PDF count; documents may arrive out of order, so each
+    carries its id.
+    """
+    data = request.get_json()
+    url = data.get('url', '').strip()
+    
+    if not url:
+        return jsonify({'error': 'URL is required'}), 400
+    
+    def generate():
+        # Set up inside the generator, so nothing is left behind if the
+        # client disconnects before the response starts
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with CourtPDFScraper(output_dir=temp_dir, save_pdfs=False) as scraper:
+                pdf_links = scraper.get_pdf_links(url)
+                yield orjson.dumps({'pdf_count': len(pdf_links)}) + b'\n'
+                
+                for doc_id, pdf_info, downloaded, text in scraper.iter_documents(pdf_links):
+                    document = {
+                        'id': doc_id,
+                        'filename': Path(pdf_info.filename).stem + '.txt'
+                    }
+                    if text is not None:
+                        document['content'] = text
+                    elif downloaded:
+                        document['error'] = 'Text extraction failed'
+                    else:
+                        document['error'] = 'Download failed'
+                    yield orjson.dumps(document) + b'\n'
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
 @app.route('/status/<job_id>')
 def job_status(job_id):
     """Get status of a scraping job."""
-    if job_id not in active_jobs:
+    state = load_job_state(job_id)
+    if state is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job = active_jobs[job_id]
-    
-    response = {
-        'job_id': job_id,
-        'status': job.status,
-        'progress': job.progress,
-        'total_files': job.total_files,
-        'processed_files': job.processed_files
-    }
-    
-    if job.error:
-        response['error'] = job.error
-    
-    if job.status == 'completed':
-        if job.merge_texts:
-            response['download_type'] = 'merged'
-            response['file_count'] = 1
-        else:
-            response['download_type'] = 'separate'
-            response['file_count'] = len(job.results.get('txt_files', []))
+    response = {'job_id': job_id}
+    response.update((field, value) for field, value in state.items() if field != 's3_key')
     
     return jsonify(response)
 
 @app.route('/download/<job_id>')
 def download_results(job_id):
     """Download the results of a completed job."""
-    if job_id not in active_jobs:
+    state = load_job_state(job_id)
+    if state is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job = active_jobs[job_id]
-    
-    if job.status != 'completed':
+    if state['status'] != 'completed':
         return jsonify({'error': 'Job not completed'}), 400
     
+    def cleanup(response):
+        # Clean up job data after download
+        threading.Timer(60.0, lambda: cleanup_job(job_id, state.get('s3_key'))).start()
+        return response
+    
     try:
-        if job.merge_texts:
-            # Return single merged file
-            merged_file = job.results.get('merged_file')
-            if merged_file and os.path.exists(merged_file):
-                @after_this_request
-                def cleanup(response):
-                    # Clean up temp directory after download
-                    threading.Timer(60.0, lambda: cleanup_job(job_id)).start()
-                    return response
-                
-                return send_file(
-                    merged_file,
-                    as_attachment=True,
-                    download_name='merged_court_documents.txt',
-                    mimetype='text/plain'
-                )
-        else:
-            # Create ZIP file with all text files
-            zip_path = os.path.join(job.temp_dir, f'court_documents_{job_id}.zip')
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                txt_files = job.results.get('txt_files', [])
-                for txt_file in txt_files:
-                    if os.path.exists(txt_file):
-                        zipf.write(txt_file, os.path.basename(txt_file))
-            
-            @after_this_request
-            def cleanup(response):
-                # Clean up temp directory after download
-                threading.Timer(60.0, lambda: cleanup_job(job_id)).start()
-                return response
-            
+        if state.get('s3_key'):
+            # Results were uploaded by whichever worker ran the job
+            after_this_request(cleanup)
+            return redirect(s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': S3_BUCKET, 'Key': state['s3_key']},
+                ExpiresIn=300
+            ))
+        
+        with jobs_lock:
+            job = active_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job results are not available on this worker'}), 404
+        
+        download = job.download_file()
+        if download:
+            path, download_name, mimetype = download
+            after_this_request(cleanup)
             return send_file(
-                zip_path,
+                path,
                 as_attachment=True,
-                download_name=f'court_documents_{job_id}.zip',
-                mimetype='application/zip'
+                download_name=download_name,
+                mimetype=mimetype
             )
             
     except Exception as e:
@@ -193,17 +354,24 @@ def download_results(job_id):
     
     return jsonify({'error': 'No files available for download'}), 404
 
-def cleanup_job(job_id):
-    """Clean up job data and temporary files."""
-    if job_id in active_jobs:
-        job = active_jobs[job_id]
-        if job.temp_dir and os.path.exists(job.temp_dir):
-            import shutil
-            try:
-                shutil.rmtree(job.temp_dir)
-            except:
-                pass
-        del active_jobs[job_id]
+def cleanup_job(job_id, s3_key=None):
+    """Clean up job data, temporary files and uploaded results."""
+    if redis_client is not None:
+        redis_client.expire(f'job:{job_id}', 300)
+    
+    if s3_key and s3_client is not None:
+        try:
+            s3_client.delete_object(Bucket=S3_BUCKET, Key=s3_key)
+        except Exception as e:
+            print(f"Error deleting s3://{S3_BUCKET}/{s3_key}: {e}")
+    
+    with jobs_lock:
+        job = active_jobs.pop(job_id, None)
+    if job is not None and job.temp_dir and os.path.exists(job.temp_dir):
+        try:
+            shutil.rmtree(job.temp_dir)
+        except:
+            pass
 
 @app.route('/health')
 def health_check():
@@ -8,149 +8,333 @@ Interactive terminal interface with options for separate or merged output.
 import os
 import re
 import time
-import requests
+import httpx
 import argparse
+import threading
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from concurrent.futures import (FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from contextlib import ExitStack
 from pathlib import Path
-from urllib.parse import urljoin, urlparse, parse_qs
-from bs4 import BeautifulSoup
-import PyPDF2
-from typing import List, Dict, Optional
+from urllib.parse import unquote_plus, urljoin
+from typing import TYPE_CHECKING, BinaryIO, Iterator, List, Dict, NamedTuple, Optional, Tuple, Union
+
+# selectolax and pypdfium2 are imported where they're first used so that
+# importing this module (e.g. on a serverless cold start) stays cheap
+if TYPE_CHECKING:
+    from selectolax.lexbor import LexborHTMLParser
+
+# Patterns used when scanning case pages for PDF links
+_PDF_SIZE_RE = re.compile(r'PDF/(\d+)\s*KB')
+_PDF_TD_RE = re.compile(r'PDF', re.I)
+
+# Case number query parameter, e.g. Case.aspx?cn=25-0674&coa=cossup
+_CN_RE = re.compile(r'[?&]cn=([^&#]+)')
+
+
+def _case_num(url: str) -> str:
+    """Return the case number from a case page URL."""
+    match = _CN_RE.search(url)
+    return unquote_plus(match.group(1)) if match else 'unknown'
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or as an HTTP date."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _lone_string(node) -> Optional[str]:
+    """Return a node's text if it holds a single string, like BeautifulSoup's .string.
+    
+    The node, or each element it wraps one inside another, must have
+    exactly one child; mixed content gives None.
+    """
+    while True:
+        child = node.child
+        if child is None or child.next is not None:
+            return None
+        if child.tag == '-text':
+            return child.text()
+        node = child
+
+
+class PdfLink(NamedTuple):
+    """A PDF document linked from a case page."""
+    url: str
+    text: str
+    size_kb: str
+    filename: str
+
+
+# PDFium is not thread-safe, so every call into it holds this lock
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _reset_pdfium_lock():
+    """Give a forked child a fresh lock in case another thread held it."""
+    global _PDFIUM_LOCK
+    _PDFIUM_LOCK = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pdfium_lock)
+
+
+def count_pdf_pages(pdf_data: Union[bytes, BinaryIO]) -> int:
+    """Return the number of pages in a PDF."""
+    import pypdfium2 as pdfium
+    
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_data)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def extract_pdf_pages(pdf_data: Union[bytes, BinaryIO], start: int = 0,
+                      stop: Optional[int] = None) -> List[str]:
+    """Extract the raw text of pages [start, stop) of a PDF."""
+    import pypdfium2 as pdfium
+    
+    text_content = []
+    
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_data)
+        try:
+            for page_num in range(start, len(pdf) if stop is None else stop):
+                page = pdf[page_num]
+                textpage = page.get_textpage()
+                text_content.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+    
+    return text_content
+
+
+def join_pdf_pages(pages: List[str]) -> str:
+    """Join extracted page texts into a single document."""
+    # PDFium keeps line breaks within a page but uses CRLF
+    return '\n'.join(pages).replace('\r\n', '\n').strip()
+
+
+def _pdf_pages_worker(pdf_data: bytes, doc_id: int, start: int,
+                      stop: Optional[int]) -> Tuple[int, int, List[str]]:
+    """Process pool entry point: extract one page range of one document."""
+    return doc_id, start, extract_pdf_pages(pdf_data, start, stop)
+
 
 class CourtPDFScraper:
-    def __init__(self, output_dir: str = "court_documents", merge_texts: bool = False):
-        self.session = requests.Session()
+    def __init__(self, output_dir: str = "court_documents", merge_texts: bool = False,
+                 save_pdfs: bool = True):
+        # One HTTP/2 client shared by all download threads: concurrent
+        # requests are multiplexed over a single TLS connection per host
+        self.client = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        )
+        
         self.output_dir = Path(output_dir)
         self.pdf_dir = self.output_dir / "pdfs"
         self.txt_dir = self.output_dir / "txt_files"
         self.merge_texts = merge_texts
-        self.merged_content = []
+        self.save_pdfs = save_pdfs
+        self.merged_path = self.output_dir / "merged_documents.txt"
+        self._merged_file = None
+        self._merged_lock = threading.Lock()
         
-        # Create directories
-        self.pdf_dir.mkdir(parents=True, exist_ok=True)
+        # Create directories (output_dir holds the merged file)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if save_pdfs:
+            self.pdf_dir.mkdir(parents=True, exist_ok=True)
         if not merge_texts:
             self.txt_dir.mkdir(parents=True, exist_ok=True)
         
         # Bot-friendly headers
-        self.session.headers.update({
+        self.client.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
             'DNT': '1',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
         
-        # Respectful delays (seconds)
-        self.delay_between_requests = 2
-        self.delay_between_downloads = 1
+        # Back off only when the server says it is overloaded (429/503),
+        # honouring Retry-After or doubling from initial_backoff (seconds)
+        self.retry_statuses = (429, 503)
+        self.max_retries = 3
+        self.initial_backoff = 2
+        self.max_backoff = 60
+        self._throttle_until = 0.0
+        self._throttle_lock = threading.Lock()
+        
+        # Number of PDFs downloaded concurrently, and processes parsing them
+        self.max_workers = 8
+        self.parse_workers = os.cpu_count() or 1
+        
+        # Documents at least twice this long are split across parse workers
+        self.pages_per_task = 10
     
-    def get_page_content(self, url: str) -> Optional[BeautifulSoup]:
-        """Fetch page content with proper delays and error handling."""
-        try:
-            print(f"Fetching: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+    def close(self):
+        """Close the HTTP client and any merged file a failed scrape left open."""
+        self.client.close()
+        with self._merged_lock:
+            if self._merged_file is not None:
+                self._merged_file.close()
+                self._merged_file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET a URL, waiting and retrying while the server is throttling us."""
+        backoff = self.initial_backoff
+        for attempt in range(self.max_retries + 1):
+            # A throttled response pauses every thread, not just this one
+            with self._throttle_lock:
+                remaining = self._throttle_until - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
             
-            # Add delay to be respectful
-            time.sleep(self.delay_between_requests)
+            response = self.client.get(url, **kwargs)
+            if response.status_code not in self.retry_statuses or attempt == self.max_retries:
+                response.raise_for_status()
+                return response
             
-            return BeautifulSoup(response.content, 'html.parser')
+            delay = _retry_after_seconds(response)
+            delay = min(backoff if delay is None else delay, self.max_backoff)
+            print(f"Server returned {response.status_code} for {url}, retrying in {delay:g}s")
+            response.close()
+            with self._throttle_lock:
+                self._throttle_until = max(self._throttle_until, time.monotonic() + delay)
+            backoff *= 2
+    
+    def get_page_content(self, url: str) -> Optional['LexborHTMLParser']:
+        """Fetch page content with backoff and error handling."""
+        try:
+            # The Lexbor backend; selectolax 1.0 dropped the Modest one
+            # (selectolax.parser)
+            from selectolax.lexbor import LexborHTMLParser
+            
+            print(f"Fetching: {url}")
+            response = self._get(url, timeout=30)
+            return LexborHTMLParser(response.content)
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return None
     
-    def find_pdf_links(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
+    def find_pdf_links(self, tree: 'LexborHTMLParser', base_url: str) -> List[PdfLink]:
         """Extract PDF links from the page."""
         pdf_links = []
+        seen_urls = set()
         
         # Look for PDF links in various patterns
         # Pattern 1: Direct links to SearchMedia.aspx
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
-            if 'SearchMedia.aspx' in href and 'MediaVersionID' in href:
-                # Extract file info from link text
-                text = link.get_text(strip=True)
-                size_match = re.search(r'PDF/(\d+)\s*KB', text)
-                size = size_match.group(1) if size_match else 'unknown'
-                
-                pdf_info = {
-                    'url': urljoin(base_url, href),
-                    'text': text,
-                    'size_kb': size,
-                    'filename': f"document_{len(pdf_links)+1}_{size}KB.pdf"
-                }
-                pdf_links.append(pdf_info)
+        for link in tree.css('a[href*="SearchMedia.aspx"][href*="MediaVersionID"]'):
+            href = link.attributes.get('href', '')
+            
+            # Extract file info from link text
+            text = link.text(strip=True)
+            size_match = _PDF_SIZE_RE.search(text)
+            size = size_match.group(1) if size_match else 'unknown'
+            
+            pdf_info = PdfLink(
+                url=urljoin(base_url, href),
+                text=text,
+                size_kb=size,
+                filename=f"document_{len(pdf_links)+1}_{size}KB.pdf"
+            )
+            pdf_links.append(pdf_info)
+            seen_urls.add(pdf_info.url)
         
         # Pattern 2: Look for any PDF references in tables or divs
-        for element in soup.find_all(['td', 'div'], string=re.compile(r'PDF', re.I)):
-            parent = element.find_parent()
+        # (Lexbor returns matches in document order)
+        for element in tree.css('td, div'):
+            string = _lone_string(element)
+            if string is None or not _PDF_TD_RE.search(string):
+                continue
+            parent = element.parent
             if parent:
-                link = parent.find('a', href=True)
-                if link and 'SearchMedia.aspx' in link.get('href', ''):
-                    href = link.get('href')
-                    if href not in [p['url'] for p in pdf_links]:  # Avoid duplicates
-                        pdf_info = {
-                            'url': urljoin(base_url, href),
-                            'text': element.get_text(strip=True),
-                            'size_kb': 'unknown',
-                            'filename': f"document_{len(pdf_links)+1}.pdf"
-                        }
+                link = parent.css_first('a[href]')
+                if link and 'SearchMedia.aspx' in (link.attributes.get('href') or ''):
+                    full_url = urljoin(base_url, link.attributes.get('href'))
+                    if full_url not in seen_urls:  # Avoid duplicates
+                        pdf_info = PdfLink(
+                            url=full_url,
+                            text=element.text(strip=True),
+                            size_kb='unknown',
+                            filename=f"document_{len(pdf_links)+1}.pdf"
+                        )
                         pdf_links.append(pdf_info)
+                        seen_urls.add(full_url)
         
         return pdf_links
     
-    def download_pdf(self, pdf_info: Dict[str, str]) -> Optional[Path]:
-        """Download a single PDF file."""
+    def download_pdf(self, pdf_info: PdfLink) -> Optional[BytesIO]:
+        """Download a single PDF into memory, saving a copy if save_pdfs is set."""
         try:
-            print(f"Downloading: {pdf_info['text']} ({pdf_info['size_kb']} KB)")
+            print(f"Downloading: {pdf_info.text} ({pdf_info.size_kb} KB)")
             
-            response = self.session.get(pdf_info['url'], timeout=60, stream=True)
-            response.raise_for_status()
+            response = self._get(pdf_info.url, timeout=60)
             
             # Check if response is actually a PDF
             content_type = response.headers.get('content-type', '').lower()
             if 'pdf' not in content_type:
                 print(f"Warning: Content type is {content_type}, not PDF")
             
-            # Save PDF
-            pdf_path = self.pdf_dir / pdf_info['filename']
-            with open(pdf_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # httpx has already read (and decoded) the whole body
+            pdf_buf = BytesIO(response.content)
             
-            print(f"Saved: {pdf_path}")
-            time.sleep(self.delay_between_downloads)
+            # Save PDF
+            if self.save_pdfs:
+                pdf_path = self.pdf_dir / pdf_info.filename
+                with open(pdf_path, 'wb') as f:
+                    f.write(pdf_buf.getbuffer())
+                print(f"Saved: {pdf_path}")
             
-            return pdf_path
+            return pdf_buf
             
         except Exception as e:
-            print(f"Error downloading {pdf_info['url']}: {e}")
+            print(f"Error downloading {pdf_info.url}: {e}")
             return None
     
-    def pdf_to_text(self, pdf_path: Path, doc_id: int) -> Optional[Path]:
-        """Convert PDF to text file or add to merged content."""
+    def save_text(self, full_text: str, doc_id: int, filename: str) -> Optional[Path]:
+        """Write extracted text to its own file or add it to merged content."""
         try:
-            with open(pdf_path, 'rb') as pdf_file:
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                text_content = []
-                
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text_content.append(page.extract_text())
-                    text_content.append("\n")
-            
-            full_text = ''.join(text_content).strip()
-            
             if self.merge_texts:
-                # Add to merged content with document separators
-                self.merged_content.append(f"<document id={doc_id}>\n{full_text}\n</document>")
+                # Append straight to the merged file with document separators,
+                # so the whole case is never held in memory as one string
+                with self._merged_lock:
+                    if self._merged_file is None:
+                        self._merged_file = open(self.merged_path, 'w', encoding='utf-8')
+                    else:
+                        self._merged_file.write("\n\n")
+                    self._merged_file.write(f"<document id={doc_id}>\n")
+                    self._merged_file.write(full_text)
+                    self._merged_file.write("\n</document>")
                 print(f"Added to merged content: document {doc_id}")
                 return None
             else:
                 # Write to individual text file
-                txt_filename = pdf_path.stem + '.txt'
+                txt_filename = Path(filename).stem + '.txt'
                 txt_path = self.txt_dir / txt_filename
                 
                 with open(txt_path, 'w', encoding='utf-8') as txt_file:
@@ -160,27 +344,173 @@ class CourtPDFScraper:
                 return txt_path
             
         except Exception as e:
-            print(f"Error converting {pdf_path} to text: {e}")
+            print(f"Error saving text for {filename}: {e}")
             return None
     
+    def _make_parse_executor(self):
+        """Create the process pool for PDF parsing, or a thread if unavailable."""
+        try:
+            return ProcessPoolExecutor(max_workers=self.parse_workers)
+        except (OSError, NotImplementedError) as e:
+            # Some serverless runtimes (e.g. AWS Lambda) lack /dev/shm
+            print(f"Process pool unavailable ({e}), parsing in-process")
+            return ThreadPoolExecutor(max_workers=1)
+    
+    def _page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        """Divide a document's pages into ranges to parse in parallel."""
+        if page_count < self.pages_per_task * 2:
+            return [(0, page_count)]
+        
+        # One range per worker, but never smaller than pages_per_task
+        size = max(self.pages_per_task, -(-page_count // self.parse_workers))
+        return [(start, min(start + size, page_count))
+                for start in range(0, page_count, size)]
+    
     def save_merged_file(self) -> Optional[Path]:
-        """Save all merged content to a single file."""
-        if not self.merged_content:
-            return None
+        """Finish the merged file written by save_text."""
+        with self._merged_lock:
+            if self._merged_file is None:
+                return None
             
-        merged_path = self.output_dir / "merged_documents.txt"
-        try:
-            with open(merged_path, 'w', encoding='utf-8') as f:
-                f.write('\n\n'.join(self.merged_content))
+            try:
+                self._merged_file.close()
+                print(f"Saved merged file: {self.merged_path}")
+                return self.merged_path
+            except Exception as e:
+                print(f"Error saving merged file: {e}")
+                return None
+            finally:
+                self._merged_file = None
+    
+    def get_pdf_links(self, url: str) -> List[PdfLink]:
+        """Fetch a case page and return the PDF links found on it."""
+        # Get the main page
+        tree = self.get_page_content(url)
+        if tree is None:
+            print("Failed to fetch main page")
+            return []
+        
+        # Find PDF links
+        pdf_links = self.find_pdf_links(tree, url)
+        print(f"Found {len(pdf_links)} PDF links")
+        
+        if not pdf_links:
+            print("No PDF links found. The page structure might have changed.")
+        
+        return pdf_links
+    
+    def iter_documents(self, pdf_links: List[PdfLink]
+                       ) -> Iterator[Tuple[int, PdfLink, bool, Optional[str]]]:
+        """Download and convert PDFs, yielding each document as it finishes.
+        
+        Yields (doc_id, pdf_info, downloaded, text) once per link, in
+        completion order. text is None if the download or conversion failed.
+        """
+        # PDFs download on threads; as each arrives it is parsed on a
+        # process pool while the remaining downloads continue.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as download_executor, \
+                ExitStack() as parse_pools:
+            parse_executor = parse_pools.enter_context(self._make_parse_executor())
+            downloads = {download_executor.submit(self.download_pdf, pdf_info): (i, pdf_info)
+                         for i, pdf_info in enumerate(pdf_links, 1)}
             
-            print(f"Saved merged file: {merged_path}")
-            return merged_path
-        except Exception as e:
-            print(f"Error saving merged file: {e}")
-            return None
+            # Long documents are split into page ranges across the pool.
+            # Their pages are counted in the pool as well, so PDFium is
+            # only ever called from parse workers.
+            split = isinstance(parse_executor, ProcessPoolExecutor)
+            counts = {}
+            parses = {}
+            pdf_infos = {}
+            pending = {}
+            page_parts = {}
+            downloaded = 0
+            
+            def submit_parse(fn, *args):
+                # A worker that dies (e.g. out of memory on a huge scan)
+                # breaks the whole pool. Its in-flight documents fail on
+                # their own; the rest go to a fresh pool.
+                nonlocal parse_executor
+                try:
+                    future = parse_executor.submit(fn, *args)
+                except BrokenExecutor as e:
+                    print(f"Parse pool failed ({e}), starting a new one")
+                    parse_executor = parse_pools.enter_context(self._make_parse_executor())
+                    future = parse_executor.submit(fn, *args)
+                not_done.add(future)
+                return future
+            
+            def submit_ranges(i, pdf_data, ranges):
+                pending[i] = len(ranges)
+                page_parts[i] = {}
+                for start, stop in ranges:
+                    parses[submit_parse(_pdf_pages_worker, pdf_data, i, start, stop)] = i
+            
+            not_done = set(downloads)
+            while not_done:
+                done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in downloads:
+                        i, pdf_info = downloads.pop(future)
+                        downloaded += 1
+                        print(f"\nDownloaded PDF {downloaded}/{len(pdf_links)} (document {i})")
+                        
+                        try:
+                            pdf_buf = future.result()
+                        except Exception as e:
+                            print(f"Error downloading {pdf_info.url}: {e}")
+                            pdf_buf = None
+                        if not pdf_buf:
+                            yield i, pdf_info, False, None
+                            continue
+                        
+                        pdf_data = pdf_buf.getvalue()
+                        pdf_infos[i] = pdf_info
+                        if split:
+                            counts[submit_parse(count_pdf_pages, pdf_data)] = (i, pdf_data)
+                        else:
+                            submit_ranges(i, pdf_data, [(0, None)])
+                        continue
+                    
+                    if future in counts:
+                        i, pdf_data = counts.pop(future)
+                        try:
+                            ranges = self._page_ranges(future.result())
+                        except Exception as e:
+                            print(f"Error converting {pdf_infos[i].filename} to text: {e}")
+                            yield i, pdf_infos.pop(i), True, None
+                            continue
+                        
+                        submit_ranges(i, pdf_data, ranges)
+                        continue
+                    
+                    i = parses.pop(future)
+                    if i not in pending:
+                        continue  # an earlier range of this document failed
+                    try:
+                        _, start, pages = future.result()
+                    except Exception as e:
+                        print(f"Error converting {pdf_infos[i].filename} to text: {e}")
+                        del pending[i], page_parts[i]
+                        yield i, pdf_infos.pop(i), True, None
+                        continue
+                    
+                    page_parts[i][start] = pages
+                    pending[i] -= 1
+                    if pending[i]:
+                        continue
+                    
+                    # All ranges are in; reassemble pages in order
+                    parts = page_parts.pop(i)
+                    del pending[i]
+                    pages = [page for start in sorted(parts) for page in parts[start]]
+                    yield i, pdf_infos.pop(i), True, join_pdf_pages(pages)
     
     def scrape_case_page(self, url: str) -> Dict[str, List[Path]]:
-        """Main method to scrape a case page and download all PDFs."""
+        """Main method to scrape a case page and download all PDFs.
+        
+        'pdfs' lists the saved PDF paths, or just their filenames when
+        save_pdfs is off.
+        """
         results = {
             'pdfs': [],
             'txt_files': []
@@ -188,33 +518,43 @@ class CourtPDFScraper:
         
         print(f"Starting scrape of: {url}")
         
-        # Get the main page
-        soup = self.get_page_content(url)
-        if not soup:
-            print("Failed to fetch main page")
-            return results
-        
-        # Find PDF links
-        pdf_links = self.find_pdf_links(soup, url)
-        print(f"Found {len(pdf_links)} PDF links")
-        
+        pdf_links = self.get_pdf_links(url)
         if not pdf_links:
-            print("No PDF links found. The page structure might have changed.")
             return results
         
-        # Download each PDF and convert to text
-        for i, pdf_info in enumerate(pdf_links, 1):
-            print(f"\nProcessing PDF {i}/{len(pdf_links)}")
+        pdf_paths = {}
+        txt_paths = {}
+        
+        # The merged file is written in page order, so documents that finish
+        # early wait here until every document before them is done
+        finished = {}
+        next_id = 1
+        for i, pdf_info, downloaded, full_text in self.iter_documents(pdf_links):
+            filename = pdf_info.filename
+            if downloaded:
+                pdf_paths[i] = self.pdf_dir / filename if self.save_pdfs else filename
+            
+            finished[i] = (full_text, filename)
+            if self.merge_texts:
+                ready = []
+                while next_id in finished:
+                    ready.append(next_id)
+                    next_id += 1
+            else:
+                ready = [i]
             
-            # Download PDF
-            pdf_path = self.download_pdf(pdf_info)
-            if pdf_path:
-                results['pdfs'].append(pdf_path)
+            for doc_id in ready:
+                full_text, filename = finished.pop(doc_id)
+                if full_text is None:
+                    continue
                 
-                # Convert to text (pass document ID)
-                txt_path = self.pdf_to_text(pdf_path, i)
+                txt_path = self.save_text(full_text, doc_id, filename)
                 if txt_path:
-                    results['txt_files'].append(txt_path)
+                    txt_paths[doc_id] = txt_path
+        
+        # Keep results in page order regardless of completion order
+        results['pdfs'] = [pdf_paths[i] for i in sorted(pdf_paths)]
+        results['txt_files'] = [txt_paths[i] for i in sorted(txt_paths)]
         
         # Save merged file if using merge mode
         if self.merge_texts:
@@ -263,14 +603,7 @@ def interactive_mode():
             print("Please enter 1 or 2.")
     
     # Generate output directory name from URL
-    try:
-        import urllib.parse
-        parsed = urllib.parse.urlparse(url)
-        query = urllib.parse.parse_qs(parsed.query)
-        case_num = query.get('cn', ['unknown'])[0]
-        output_dir = f"court_case_{case_num}".replace('-', '_')
-    except:
-        output_dir = "court_case_documents"
+    output_dir = f"court_case_{_case_num(url)}".replace('-', '_')
     
     print(f"\nStarting scraper...")
     print(f"Output directory: {output_dir}")
@@ -278,8 +611,8 @@ def interactive_mode():
     print()
     
     # Initialize and run scraper
-    scraper = CourtPDFScraper(output_dir=output_dir, merge_texts=merge_texts)
-    results = scraper.scrape_case_page(url)
+    with CourtPDFScraper(output_dir=output_dir, merge_texts=merge_texts) as scraper:
+        results = scraper.scrape_case_page(url)
     
     # Print summary
     print(f"\n=== SUMMARY ===")
@@ -316,6 +649,8 @@ Examples:
                              help='Create separate text files (default)')
     output_group.add_argument('--merged', action='store_true',
                              help='Create single merged text file')
+    parser.add_argument('--no-pdfs', action='store_true',
+                       help="Don't keep the downloaded PDFs, only the text")
     
     args = parser.parse_args()
     
@@ -330,14 +665,7 @@ Examples:
         if args.output_dir:
             output_dir = args.output_dir
         else:
-            try:
-                import urllib.parse
-                parsed = urllib.parse.urlparse(args.url)
-                query = urllib.parse.parse_qs(parsed.query)
-                case_num = query.get('cn', ['unknown'])[0]
-                output_dir = f"court_case_{case_num}".replace('-', '_')
-            except:
-                output_dir = "court_case_documents"
+            output_dir = f"court_case_{_case_num(args.url)}".replace('-', '_')
         
         print(f"Scraping: {args.url}")
         print(f"Output directory: {output_dir}")
@@ -345,8 +673,9 @@ Examples:
         print()
         
         # Initialize and run scraper
-        scraper = CourtPDFScraper(output_dir=output_dir, merge_texts=merge_texts)
-        results = scraper.scrape_case_page(args.url)
+        with CourtPDFScraper(output_dir=output_dir, merge_texts=merge_texts,
+                             save_pdfs=not args.no_pdfs) as scraper:
+            results = scraper.scrape_case_page(args.url)
         
         # Print summary
         print(f"\n=== SUMMARY ===")
@@ -40,11 +40,11 @@ class FlaskScrapingJob:
             output_dir = os.path.join(self.temp_dir, f"court_case_{self.job_id}")
             
             # Initialize scraper with our proven class
-            scraper = CourtPDFScraper(output_dir=output_dir, merge_texts=self.merge_texts)
-            
-            # Run the scraper
-            self.status = "downloading"
-            results = scraper.scrape_case_page(self.url)
+            with CourtPDFScraper(output_dir=output_dir, merge_texts=self.merge_texts,
+                                 save_pdfs=False) as scraper:
+                # Run the scraper
+                self.status = "downloading"
+                results = scraper.scrape_case_page(self.url)
             
             self.total_files = len(results.get('pdfs', []))
             self.processed_files = self.total_files